@@ -1,34 +1,101 @@
 """ATS-Mini CLI — click + click-repl interface for the ATS-Mini SDK."""
 
 import asyncio
+import atexit
 import json as _json
 import shlex
 import sys
+import time
 
 import click
-from prompt_toolkit import PromptSession
-from prompt_toolkit.completion import WordCompleter
-from prompt_toolkit.history import InMemoryHistory
 
-from ats_sdk import AsyncSerialRpc, AsyncWebSocketRpc, AsyncBleRpc, Radio, RpcError
+# Transports and prompt_toolkit are imported where they are used so one-shot
+# commands don't pay for the modules they never touch
+from ats_sdk import Radio, RpcError
+
+try:
+    import orjson
+
+    def _dumps(data):
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=str,
+        ).decode()
+
+except ImportError:
+
+    def _dumps(data):
+        return _json.dumps(data, indent=2, default=str)
+
+
+# Idle time after which the REPL pings the radio before running a command
+KEEPALIVE_INTERVAL = 15.0
+
+# Lifetime of cached settings; the knobs on the radio can change them too
+SETTINGS_TTL = 5.0
+
+_loop = None
+
+
+def _get_loop():
+    """Return the process-wide event loop, creating it on first use.
+
+    Uses uvloop when it is installed (``pip install "ats-cli[fast]"``).
+    """
+    global _loop
+    if _loop is None:
+        try:
+            import uvloop
+        except ImportError:
+            _loop = asyncio.new_event_loop()
+        else:
+            _loop = uvloop.new_event_loop()
+        atexit.register(_shutdown_loop)
+    return _loop
+
+
+def _shutdown_loop():
+    """Close the process-wide event loop at interpreter exit."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        return
+    try:
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+        _loop.run_until_complete(_loop.shutdown_default_executor())
+    finally:
+        _loop.close()
+        _loop = None
 
 
 class Connection:
     """Manages a lazy, persistent connection to the radio."""
 
-    def __init__(self, port=None, ws=None, ble=None):
+    __slots__ = (
+        "port",
+        "ws",
+        "ble",
+        "use_json",
+        "use_cache",
+        "_transport",
+        "_radio",
+        "_last_used",
+        "_loop",
+        "_cache",
+    )
+
+    def __init__(self, port=None, ws=None, ble=None, use_json=False, use_cache=True):
         self.port = port
         self.ws = ws
         self.ble = ble
+        self.use_json = use_json
+        self.use_cache = use_cache
         self._transport = None
         self._radio = None
-        self._loop = None
-
-    def _get_loop(self):
-        if self._loop is None or self._loop.is_closed():
-            self._loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self._loop)
-        return self._loop
+        self._last_used = 0.0
+        self._loop = _get_loop()
+        # key -> (expiry as time.monotonic() or None, value)
+        self._cache = {}
 
     @property
     def radio(self) -> Radio:
@@ -38,48 +105,131 @@ class Connection:
         return self._radio
 
     def _connect(self):
-        loop = self._get_loop()
         if self.ws:
+            from ats_sdk.transports.websocket import AsyncWebSocketRpc
+
             t = AsyncWebSocketRpc(self.ws)
         elif self.ble is not None:
+            from ats_sdk.transports.ble import AsyncBleRpc
+
             name = self.ble if self.ble else "ATS-Mini"
             t = AsyncBleRpc(name)
         elif self.port:
+            from ats_sdk.transports.serial import AsyncSerialRpc
+
             t = AsyncSerialRpc(self.port)
         else:
             raise click.UsageError(
                 "No transport specified. Use --port, --ws, or --ble "
                 "(or set ATSMINI_PORT / ATSMINI_WS_URL / ATSMINI_BLE)."
             )
-        loop.run_until_complete(t.connect())
+        self._loop.run_until_complete(t.connect())
         self._transport = t
         self._radio = Radio(t)
 
     def run(self, coro):
-        """Run an async coroutine synchronously."""
-        return self._get_loop().run_until_complete(coro)
+        """Run an async coroutine synchronously.
+
+        A ConnectionError drops the transport so the next command reconnects.
+        Ctrl-C cancels the coroutine before re-raising, so it can't be left
+        suspended mid-read holding the transport.
+        """
+        task = self._loop.create_task(coro)
+        try:
+            return self._loop.run_until_complete(task)
+        except KeyboardInterrupt:
+            task.cancel()
+            try:
+                self._loop.run_until_complete(task)
+            except BaseException:
+                pass
+            raise
+        except ConnectionError:
+            self.close()
+            raise
+        finally:
+            self._last_used = time.monotonic()
+
+    def run_many(self, *coros):
+        """Run independent coroutines concurrently and return their results.
+
+        Requests are pipelined on the transport, so N calls cost about one
+        link round-trip instead of N.
+        """
+
+        async def _gather():
+            return await asyncio.gather(*coros)
+
+        return self.run(_gather())
+
+    def cached(self, key, getter, ttl=None):
+        """Return ``getter()``'s result, reusing a cached copy when possible.
+
+        ``ttl`` is in seconds; None caches until invalidated or disconnected.
+        """
+        if self.use_cache:
+            entry = self._cache.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                return entry[1]
+        result = self.run(getter())
+        expires = None if ttl is None else time.monotonic() + ttl
+        self._cache[key] = (expires, result)
+        return result
+
+    def run_setter(self, coro):
+        """Run a coroutine that changes radio state, then drop cached settings.
+
+        The cache goes even when the call fails: a request that timed out or
+        was interrupted may still have reached the radio.
+        """
+        try:
+            return self.run(coro)
+        finally:
+            self.invalidate("settings")
+
+    def invalidate(self, *keys):
+        """Drop cached results for ``keys`` (all of them if none given)."""
+        if not keys:
+            self._cache.clear()
+        for key in keys:
+            self._cache.pop(key, None)
+
+    def keepalive(self):
+        """Ping an idle link and transparently reconnect if it went stale."""
+        if self._radio is None:
+            return
+        if time.monotonic() - self._last_used < KEEPALIVE_INTERVAL:
+            return
+        try:
+            self.run(self._radio.get_volume())
+        except (OSError, RpcError):
+            self.close()
+            self._connect()
 
     def close(self):
+        self._cache.clear()
         if self._transport:
             try:
-                self._get_loop().run_until_complete(self._transport.close())
+                self._loop.run_until_complete(self._transport.close())
             except Exception:
                 pass
             self._transport = None
             self._radio = None
-        if self._loop and not self._loop.is_closed():
-            self._loop.close()
-            self._loop = None
 
 
-def output(data, label=None):
-    """Print result in human-readable or JSON format."""
-    use_json = click.get_current_context().find_root().params.get("use_json", False)
+def output(data, label=None, use_json=None):
+    """Print result in human-readable or JSON format.
+
+    ``use_json`` defaults to the --json flag stored on the current Connection.
+    """
+    if use_json is None:
+        use_json = click.get_current_context().obj.use_json
     if use_json:
-        click.echo(_json.dumps(data, indent=2, default=str))
+        click.echo(_dumps(data))
     elif isinstance(data, dict):
-        for k, v in data.items():
-            click.echo(f"{k}: {v}")
+        # One write for the whole mapping; click.echo flushes on every call
+        if data:
+            click.echo("\n".join(f"{k}: {v}" for k, v in data.items()))
     elif label:
         click.echo(f"{label}: {data}")
     else:
@@ -105,33 +255,59 @@ pass_conn = click.make_pass_decorator(Connection)
     help="BLE device name (default: ATS-Mini)",
 )
 @click.option("--json", "use_json", is_flag=True, help="Output as JSON")
+@click.option(
+    "--no-cache", is_flag=True, help="Always re-read settings and capabilities"
+)
 @click.version_option(package_name="ats-cli")
 @click.pass_context
-def cli(ctx, port, ws, ble, use_json):
+def cli(ctx, port, ws, ble, use_json, no_cache):
     """ATS-Mini radio control CLI.
 
     Run with a command for one-shot operation, or without a command to enter
     interactive REPL mode.
     """
     ctx.ensure_object(Connection)
-    ctx.obj = Connection(port=port, ws=ws, ble=ble)
+    ctx.obj = Connection(
+        port=port, ws=ws, ble=ble, use_json=use_json, use_cache=not no_cache
+    )
+    ctx.call_on_close(ctx.obj.close)
 
     if ctx.invoked_subcommand is None:
         click.echo("ATS-Mini CLI (type 'help' for commands, 'exit' to quit)")
+        if port or ws or ble is not None:
+            # Pre-warm the link so the first command does not pay the handshake
+            try:
+                ctx.obj.radio
+            except OSError as e:
+                click.echo(f"Connection error: {e}", err=True)
         _repl(ctx)
-        ctx.obj.close()
 
 
-def _repl(group_ctx):
+_SHLEX_CHARS = frozenset("\"'\\")
+
+
+def _needs_shlex(line: str) -> bool:
+    """Return True if the line has quotes or escapes that str.split() would mangle."""
+    return not _SHLEX_CHARS.isdisjoint(line)
+
+
+def _repl(group_ctx: click.Context) -> None:
     """Interactive REPL using prompt_toolkit."""
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.completion import WordCompleter
+    from prompt_toolkit.history import InMemoryHistory
+
     group = group_ctx.command
-    commands = list(group.commands)
-    completer = WordCompleter(commands + ["help", "exit", "quit"])
+    cmd_map: dict[str, click.Command | None] = {
+        name: group.get_command(group_ctx, name)
+        for name in group.list_commands(group_ctx)
+    }
+    completer = WordCompleter(list(cmd_map) + ["help", "exit", "quit"])
     session = PromptSession(history=InMemoryHistory(), completer=completer)
 
     while True:
         try:
-            line = session.prompt("> ").strip()
+            line: str = session.prompt("> ").strip()
         except (EOFError, KeyboardInterrupt):
             break
 
@@ -143,14 +319,24 @@ def _repl(group_ctx):
             click.echo(group_ctx.get_help())
             continue
 
-        try:
-            args = shlex.split(line)
-        except ValueError as e:
-            click.echo(f"Parse error: {e}")
-            continue
+        args: list[str]
+        if _needs_shlex(line):
+            try:
+                args = shlex.split(line)
+            except ValueError as e:
+                click.echo(f"Parse error: {e}")
+                continue
+        else:
+            args = line.split()
 
         try:
-            cmd_name, cmd, args = group.resolve_command(group_ctx, args)
+            group_ctx.obj.keepalive()
+            cmd = cmd_map.get(args[0])
+            if cmd is not None:
+                cmd_name, args = args[0], args[1:]
+            else:
+                # Let click report unknown commands (and apply any normalization)
+                cmd_name, cmd, args = group.resolve_command(group_ctx, args)
             if cmd is None:
                 click.echo(f"Unknown command: {args[0] if args else line}")
                 continue
@@ -163,7 +349,7 @@ def _repl(group_ctx):
             e.show()
         except RpcError as e:
             click.echo(f"RPC error: {e}", err=True)
-        except ConnectionError as e:
+        except OSError as e:
             click.echo(f"Connection error: {e}", err=True)
         except SystemExit:
             pass
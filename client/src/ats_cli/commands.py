@@ -1,16 +1,23 @@
 """ATS-Mini CLI commands."""
 
+import os
+import re
+
 import click
 
-from ats_sdk import RpcError
+from ats_sdk import STEP_CONTROLS, RpcError
 
-from .cli import cli, output, pass_conn
+from .cli import SETTINGS_TTL, cli, output, pass_conn
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 
+_FREQ_RE = re.compile(r"^\s*([-+]?(?:\d+(?:\.\d*)?|\.\d+))\s*(MHZ|KHZ|M|K)?\s*$", re.I)
+_FREQ_MULT = {"M": 1_000_000, "MHZ": 1_000_000, "K": 1_000, "KHZ": 1_000}
+
+
 def parse_frequency(value: str) -> int:
     """Parse frequency string to Hz.
 
@@ -21,38 +28,38 @@ def parse_frequency(value: str) -> int:
 
     Returns:
         Frequency in Hz as integer.
+
+    Raises:
+        ValueError: If the value is not a valid frequency.
     """
-    v = value.strip().upper()
-    if v.endswith("MHZ"):
-        return int(float(v[:-3]) * 1_000_000)
-    if v.endswith("M"):
-        return int(float(v[:-1]) * 1_000_000)
-    if v.endswith("KHZ"):
-        return int(float(v[:-3]) * 1_000)
-    if v.endswith("K"):
-        return int(float(v[:-1]) * 1_000)
-    return int(v)
-
-
-def _get_set(conn, getter, setter, value, label):
-    """Generic get/set helper for simple value commands."""
-    try:
-        if value is None:
-            result = conn.run(getter())
-            if isinstance(result, dict):
-                output(result)
-            else:
-                output(result, label)
-        else:
-            result = conn.run(setter(value))
-            if isinstance(result, dict):
-                output(result)
+    m = _FREQ_RE.match(value)
+    if m is None:
+        raise ValueError(f"invalid frequency: {value!r}")
+    number, unit = m.groups()
+    if unit is None:
+        return int(number)
+    return int(float(number) * _FREQ_MULT[unit.upper()])
+
+
+def make_getset(getter_name, setter_name, label):
+    """Build the body of a simple get/set command.
+
+    The Radio methods are looked up by name when the command runs, so the
+    connection is still opened lazily. ``output`` prints dict results as
+    key/value pairs and scalars with ``label``.
+    """
+
+    def _impl(conn, value):
+        try:
+            if value is None:
+                result = conn.run(getattr(conn.radio, getter_name)())
             else:
-                output(result, label)
-    except RpcError as e:
-        raise click.ClickException(str(e))
-    except ConnectionError as e:
-        raise click.ClickException(str(e))
+                result = conn.run_setter(getattr(conn.radio, setter_name)(value))
+            output(result, label)
+        except (RpcError, ConnectionError) as e:
+            raise click.ClickException(str(e))
+
+    return _impl
 
 
 # ---------------------------------------------------------------------------
@@ -72,7 +79,7 @@ def status(conn):
 @pass_conn
 def settings(conn):
     """Show all device settings."""
-    result = conn.run(conn.radio.get_all_settings())
+    result = conn.cached("settings", conn.radio.get_all_settings, SETTINGS_TTL)
     output(result)
 
 
@@ -80,21 +87,58 @@ def settings(conn):
 @pass_conn
 def capabilities(conn):
     """Show device capabilities and firmware info."""
-    result = conn.run(conn.radio.get_capabilities())
+    result = conn.cached("capabilities", conn.radio.get_capabilities)
     output(result)
 
 
 # ---------------------------------------------------------------------------
-# Volume
-# ---------------------------------------------------------------------------
+# Batch
+# ---------------------------------------------------------------------------
+
+# Radio getters reachable from the batch command, keyed by command name
+BATCH_GETTERS = {
+    "status": "get_status",
+    "settings": "get_all_settings",
+    "capabilities": "get_capabilities",
+    "volume": "get_volume",
+    "frequency": "get_frequency",
+    "band": "get_band",
+    "mode": "get_mode",
+    "step": "get_step",
+    "bandwidth": "get_bandwidth",
+    "agc": "get_agc",
+    "squelch": "get_squelch",
+    "softmute": "get_softmute",
+    "avc": "get_avc",
+    "cal": "get_cal",
+    "brightness": "get_brightness",
+    "theme": "get_theme",
+    "layout": "get_ui_layout",
+    "zoom": "get_zoom_menu",
+    "scroll": "get_scroll_direction",
+    "rds": "get_rds_mode",
+    "fm-region": "get_fm_region",
+    "utc-offset": "get_utc_offset",
+    "usb-mode": "get_usb_mode",
+    "ble-mode": "get_ble_mode",
+    "wifi-mode": "get_wifi_mode",
+}
 
 
 @cli.command()
-@click.argument("value", required=False, type=int)
+@click.argument("names", nargs=-1, required=True, type=click.Choice(BATCH_GETTERS))
 @pass_conn
-def volume(conn, value):
-    """Get or set volume (0-63)."""
-    _get_set(conn, conn.radio.get_volume, conn.radio.set_volume, value, "volume")
+def batch(conn, names):
+    """Read several values in a single round-trip.
+
+    Examples: batch volume band mode, batch status settings
+    """
+    radio = conn.radio
+    try:
+        results = conn.run_many(*(getattr(radio, BATCH_GETTERS[n])() for n in names))
+    except RpcError as e:
+        raise click.ClickException(str(e))
+    output(dict(zip(names, results)))
 
 
 # ---------------------------------------------------------------------------
@@ -121,7 +165,7 @@ def frequency(conn, value):
             output(result)
         else:
             hz = parse_frequency(value)
-            result = conn.run(conn.radio.set_frequency(hz))
+            result = conn.run_setter(conn.radio.set_frequency(hz))
             output(result)
     except RpcError as e:
         raise click.ClickException(str(e))
@@ -149,161 +193,14 @@ def band(conn, value):
         else:
             try:
                 idx = int(value)
-                result = conn.run(conn.radio.set_band(idx))
+                result = conn.run_setter(conn.radio.set_band(idx))
             except ValueError:
-                result = conn.run(conn.radio.set_band_by_name(value))
+                result = conn.run_setter(conn.radio.set_band_by_name(value))
             output(result)
     except RpcError as e:
         raise click.ClickException(str(e))
 
 
-# ---------------------------------------------------------------------------
-# Mode
-# ---------------------------------------------------------------------------
-
-
-@cli.command()
-@click.argument("value", required=False, type=int)
-@pass_conn
-def mode(conn, value):
-    """Get or set demodulation mode."""
-    _get_set(conn, conn.radio.get_mode, conn.radio.set_mode, value, "mode")
-
-
-# ---------------------------------------------------------------------------
-# Step
-# ---------------------------------------------------------------------------
-
-
-@cli.command()
-@click.argument("value", required=False, type=int)
-@pass_conn
-def step(conn, value):
-    """Get or set tuning step."""
-    _get_set(conn, conn.radio.get_step, conn.radio.set_step, value, "step")
-
-
-# ---------------------------------------------------------------------------
-# Bandwidth
-# ---------------------------------------------------------------------------
-
-
-@cli.command()
-@click.argument("value", required=False, type=int)
-@pass_conn
-def bandwidth(conn, value):
-    """Get or set filter bandwidth."""
-    _get_set(
-        conn, conn.radio.get_bandwidth, conn.radio.set_bandwidth, value, "bandwidth"
-    )
-
-
-# ---------------------------------------------------------------------------
-# AGC
-# ---------------------------------------------------------------------------
-
-
-@cli.command()
-@click.argument("value", required=False, type=int)
-@pass_conn
-def agc(conn, value):
-    """Get or set AGC (Automatic Gain Control)."""
-    _get_set(conn, conn.radio.get_agc, conn.radio.set_agc, value, "agc")
-
-
-# ---------------------------------------------------------------------------
-# Squelch
-# ---------------------------------------------------------------------------
-
-
-@cli.command()
-@click.argument("value", required=False, type=int)
-@pass_conn
-def squelch(conn, value):
-    """Get or set squelch level."""
-    _get_set(conn, conn.radio.get_squelch, conn.radio.set_squelch, value, "squelch")
-
-
-# ---------------------------------------------------------------------------
-# Softmute
-# ---------------------------------------------------------------------------
-
-
-@cli.command()
-@click.argument("value", required=False, type=int)
-@pass_conn
-def softmute(conn, value):
-    """Get or set soft mute level."""
-    _get_set(conn, conn.radio.get_softmute, conn.radio.set_softmute, value, "softmute")
-
-
-# ---------------------------------------------------------------------------
-# AVC
-# ---------------------------------------------------------------------------
-
-
-@cli.command()
-@click.argument("value", required=False, type=int)
-@pass_conn
-def avc(conn, value):
-    """Get or set AVC (Automatic Volume Control)."""
-    _get_set(conn, conn.radio.get_avc, conn.radio.set_avc, value, "avc")
-
-
-# ---------------------------------------------------------------------------
-# Calibration
-# ---------------------------------------------------------------------------
-
-
-@cli.command()
-@click.argument("value", required=False, type=int)
-@pass_conn
-def cal(conn, value):
-    """Get or set calibration offset."""
-    _get_set(conn, conn.radio.get_cal, conn.radio.set_cal, value, "cal")
-
-
-# ---------------------------------------------------------------------------
-# Brightness
-# ---------------------------------------------------------------------------
-
-
-@cli.command()
-@click.argument("value", required=False, type=int)
-@pass_conn
-def brightness(conn, value):
-    """Get or set display brightness."""
-    _get_set(
-        conn, conn.radio.get_brightness, conn.radio.set_brightness, value, "brightness"
-    )
-
-
-# ---------------------------------------------------------------------------
-# Theme
-# ---------------------------------------------------------------------------
-
-
-@cli.command()
-@click.argument("value", required=False, type=int)
-@pass_conn
-def theme(conn, value):
-    """Get or set display theme."""
-    _get_set(conn, conn.radio.get_theme, conn.radio.set_theme, value, "theme")
-
-
-# ---------------------------------------------------------------------------
-# Layout
-# ---------------------------------------------------------------------------
-
-
-@cli.command()
-@click.argument("value", required=False, type=int)
-@pass_conn
-def layout(conn, value):
-    """Get or set UI layout."""
-    _get_set(conn, conn.radio.get_ui_layout, conn.radio.set_ui_layout, value, "layout")
-
-
 # ---------------------------------------------------------------------------
 # Zoom
 # ---------------------------------------------------------------------------
@@ -319,31 +216,12 @@ def zoom(conn, value):
             result = conn.run(conn.radio.get_zoom_menu())
             output("on" if result else "off", "zoom")
         else:
-            result = conn.run(conn.radio.set_zoom_menu(value == "on"))
+            result = conn.run_setter(conn.radio.set_zoom_menu(value == "on"))
             output("on" if result else "off", "zoom")
     except RpcError as e:
         raise click.ClickException(str(e))
 
 
-# ---------------------------------------------------------------------------
-# Scroll direction
-# ---------------------------------------------------------------------------
-
-
-@cli.command("scroll")
-@click.argument("value", required=False, type=int)
-@pass_conn
-def scroll_direction(conn, value):
-    """Get or set scroll direction."""
-    _get_set(
-        conn,
-        conn.radio.get_scroll_direction,
-        conn.radio.set_scroll_direction,
-        value,
-        "scroll_direction",
-    )
-
-
 # ---------------------------------------------------------------------------
 # Sleep (group)
 # ---------------------------------------------------------------------------
@@ -359,7 +237,7 @@ def sleep():
 @pass_conn
 def sleep_on(conn):
     """Enable sleep mode."""
-    conn.run(conn.radio.sleep_on())
+    conn.run_setter(conn.radio.sleep_on())
     click.echo("Sleep enabled.")
 
 
@@ -367,106 +245,271 @@ def sleep_on(conn):
 @pass_conn
 def sleep_off(conn):
     """Disable sleep mode."""
-    conn.run(conn.radio.sleep_off())
+    conn.run_setter(conn.radio.sleep_off())
     click.echo("Sleep disabled.")
 
 
-@sleep.command("timeout")
-@click.argument("value", required=False, type=int)
-@pass_conn
-def sleep_timeout(conn, value):
-    """Get or set sleep timeout."""
-    _get_set(
-        conn,
-        conn.radio.get_sleep_timeout,
-        conn.radio.set_sleep_timeout,
-        value,
+# ---------------------------------------------------------------------------
+# Simple get/set commands
+# ---------------------------------------------------------------------------
+
+# (group, name, getter, setter, label, help)
+SIMPLE_COMMANDS = [
+    (cli, "volume", "get_volume", "set_volume", "volume", "Get or set volume (0-63)."),
+    (cli, "mode", "get_mode", "set_mode", "mode", "Get or set demodulation mode."),
+    (cli, "step", "get_step", "set_step", "step", "Get or set tuning step."),
+    (
+        cli,
+        "bandwidth",
+        "get_bandwidth",
+        "set_bandwidth",
+        "bandwidth",
+        "Get or set filter bandwidth.",
+    ),
+    (
+        cli,
+        "agc",
+        "get_agc",
+        "set_agc",
+        "agc",
+        "Get or set AGC (Automatic Gain Control).",
+    ),
+    (
+        cli,
+        "squelch",
+        "get_squelch",
+        "set_squelch",
+        "squelch",
+        "Get or set squelch level.",
+    ),
+    (
+        cli,
+        "softmute",
+        "get_softmute",
+        "set_softmute",
+        "softmute",
+        "Get or set soft mute level.",
+    ),
+    (
+        cli,
+        "avc",
+        "get_avc",
+        "set_avc",
+        "avc",
+        "Get or set AVC (Automatic Volume Control).",
+    ),
+    (cli, "cal", "get_cal", "set_cal", "cal", "Get or set calibration offset."),
+    (
+        cli,
+        "brightness",
+        "get_brightness",
+        "set_brightness",
+        "brightness",
+        "Get or set display brightness.",
+    ),
+    (cli, "theme", "get_theme", "set_theme", "theme", "Get or set display theme."),
+    (
+        cli,
+        "layout",
+        "get_ui_layout",
+        "set_ui_layout",
+        "layout",
+        "Get or set UI layout.",
+    ),
+    (
+        cli,
+        "scroll",
+        "get_scroll_direction",
+        "set_scroll_direction",
+        "scroll_direction",
+        "Get or set scroll direction.",
+    ),
+    (cli, "rds", "get_rds_mode", "set_rds_mode", "rds_mode", "Get or set RDS mode."),
+    (
+        cli,
+        "fm-region",
+        "get_fm_region",
+        "set_fm_region",
+        "fm_region",
+        "Get or set FM region.",
+    ),
+    (
+        cli,
+        "utc-offset",
+        "get_utc_offset",
+        "set_utc_offset",
+        "utc_offset",
+        "Get or set UTC offset.",
+    ),
+    (
+        cli,
+        "usb-mode",
+        "get_usb_mode",
+        "set_usb_mode",
+        "usb_mode",
+        "Get or set USB mode.",
+    ),
+    (
+        cli,
+        "ble-mode",
+        "get_ble_mode",
+        "set_ble_mode",
+        "ble_mode",
+        "Get or set BLE mode.",
+    ),
+    (
+        cli,
+        "wifi-mode",
+        "get_wifi_mode",
+        "set_wifi_mode",
+        "wifi_mode",
+        "Get or set WiFi mode.",
+    ),
+    (
+        sleep,
+        "timeout",
+        "get_sleep_timeout",
+        "set_sleep_timeout",
         "sleep_timeout",
-    )
-
-
-@sleep.command("mode")
-@click.argument("value", required=False, type=int)
-@pass_conn
-def sleep_mode(conn, value):
-    """Get or set sleep mode."""
-    _get_set(
-        conn, conn.radio.get_sleep_mode, conn.radio.set_sleep_mode, value, "sleep_mode"
+        "Get or set sleep timeout.",
+    ),
+    (
+        sleep,
+        "mode",
+        "get_sleep_mode",
+        "set_sleep_mode",
+        "sleep_mode",
+        "Get or set sleep mode.",
+    ),
+]
+
+for _group, _name, _getter, _setter, _label, _help in SIMPLE_COMMANDS:
+    _group.add_command(
+        click.Command(
+            _name,
+            params=[click.Argument(["value"], required=False, type=int)],
+            callback=pass_conn(make_getset(_getter, _setter, _label)),
+            help=_help,
+        )
     )
 
 
 # ---------------------------------------------------------------------------
-# RDS
+# Up/down stepping
 # ---------------------------------------------------------------------------
 
 
-@cli.command()
-@click.argument("value", required=False, type=int)
-@pass_conn
-def rds(conn, value):
-    """Get or set RDS mode."""
-    _get_set(conn, conn.radio.get_rds_mode, conn.radio.set_rds_mode, value, "rds_mode")
+def _make_step(direction):
+    def _impl(conn, control):
+        try:
+            result = conn.run_setter(getattr(conn.radio, direction)(control))
+        except RpcError as e:
+            raise click.ClickException(str(e))
+        output(result)
 
-
-# ---------------------------------------------------------------------------
-# FM region
-# ---------------------------------------------------------------------------
+    return _impl
 
 
-@cli.command("fm-region")
-@click.argument("value", required=False, type=int)
-@pass_conn
-def fm_region(conn, value):
-    """Get or set FM region."""
-    _get_set(
-        conn, conn.radio.get_fm_region, conn.radio.set_fm_region, value, "fm_region"
+for _direction in ("up", "down"):
+    cli.add_command(
+        click.Command(
+            _direction,
+            params=[click.Argument(["control"], type=click.Choice(STEP_CONTROLS))],
+            callback=pass_conn(_make_step(_direction)),
+            help=f"Step a control {_direction} (e.g. {_direction} band).",
+        )
     )
 
 
 # ---------------------------------------------------------------------------
-# UTC offset
+# Screen
 # ---------------------------------------------------------------------------
 
 
-@cli.command("utc-offset")
-@click.argument("value", required=False, type=int)
+@cli.command()
+@click.argument(
+    "filename", type=click.Path(dir_okay=False, writable=True), default="screen.bmp"
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["binary", "rle"]),
+    default="binary",
+    help="binary = BMP image, rle = raw delta-RLE stream",
+)
 @pass_conn
-def utc_offset(conn, value):
-    """Get or set UTC offset."""
-    _get_set(
-        conn, conn.radio.get_utc_offset, conn.radio.set_utc_offset, value, "utc_offset"
+def screen(conn, filename, fmt):
+    """Save a screen capture to FILENAME (default: screen.bmp)."""
+    radio = conn.radio
+
+    async def _capture(f):
+        size = 0
+        # Write each chunk as it arrives instead of joining them at the end
+        async for chunk in radio.screen_capture(fmt):
+            f.write(chunk)
+            size += len(chunk)
+        return size
+
+    # Capture into a temporary file next to the target and move it into
+    # place only once complete, so a failed capture leaves no partial image
+    # (created with open() rather than mkstemp() to keep the usual umask
+    # permissions instead of 0600)
+    tmp_path = os.path.join(
+        os.path.dirname(os.path.abspath(filename)),
+        f".{os.path.basename(filename)}.{os.getpid()}.part",
     )
+    f = open(tmp_path, "xb")
+    try:
+        with f:
+            size = conn.run(_capture(f))
+        os.replace(tmp_path, filename)
+    except BaseException as e:
+        os.unlink(tmp_path)
+        if isinstance(e, RpcError):
+            raise click.ClickException(str(e))
+        raise
+    click.echo(f"Saved {size} bytes to {filename}")
 
 
 # ---------------------------------------------------------------------------
-# Connectivity modes
+# Events
 # ---------------------------------------------------------------------------
 
 
-@cli.command("usb-mode")
-@click.argument("value", required=False, type=int)
-@pass_conn
-def usb_mode(conn, value):
-    """Get or set USB mode."""
-    _get_set(conn, conn.radio.get_usb_mode, conn.radio.set_usb_mode, value, "usb_mode")
-
-
-@cli.command("ble-mode")
-@click.argument("value", required=False, type=int)
+@cli.command()
+@click.option(
+    "--count", "-n", type=int, default=None, help="Stop after this many events"
+)
 @pass_conn
-def ble_mode(conn, value):
-    """Get or set BLE mode."""
-    _get_set(conn, conn.radio.get_ble_mode, conn.radio.set_ble_mode, value, "ble_mode")
-
+def events(conn, count):
+    """Print radio events as they arrive (Ctrl-C to stop)."""
+    radio = conn.radio
+
+    async def _stream():
+        await radio.subscribe_events()
+        received = 0
+        async for msg in radio.events():
+            params = msg.get("params") or {}
+            if conn.use_json:
+                output({"event": msg.get("event"), "params": params})
+            else:
+                parts = ", ".join(f"{k}={v}" for k, v in params.items())
+                click.echo(f"{msg.get('event')}: {parts}")
+            received += 1
+            if count is not None and received >= count:
+                return
 
-@cli.command("wifi-mode")
-@click.argument("value", required=False, type=int)
-@pass_conn
-def wifi_mode(conn, value):
-    """Get or set WiFi mode."""
-    _get_set(
-        conn, conn.radio.get_wifi_mode, conn.radio.set_wifi_mode, value, "wifi_mode"
-    )
+    try:
+        conn.run(_stream())
+    except KeyboardInterrupt:
+        pass
+    except RpcError as e:
+        raise click.ClickException(str(e))
+    finally:
+        try:
+            conn.run(radio.unsubscribe_events())
+        except (RpcError, OSError):
+            pass
 
 
 # ---------------------------------------------------------------------------
@@ -488,16 +531,16 @@ def memory_list(conn):
     if not memories:
         click.echo("No memories saved.")
         return
-    use_json = click.get_current_context().find_root().params.get("use_json", False)
-    if use_json:
-        import json
-
-        click.echo(json.dumps(memories, indent=2, default=str))
+    if conn.use_json:
+        output(memories)
     else:
+        # click.echo flushes on every call; write the lines and flush once
+        out = click.get_text_stream("stdout")
         for mem in memories:
             if isinstance(mem, dict):
                 slot = mem.get("slot", "?")
-                parts = [f"{k}={v}" for k, v in mem.items() if k != "slot"]
-                click.echo(f"  slot {slot}: {', '.join(parts)}")
+                parts = ", ".join(f"{k}={v}" for k, v in mem.items() if k != "slot")
+                out.write(f"  slot {slot}: {parts}\n")
             else:
-                click.echo(f"  {mem}")
+                out.write(f"  {mem}\n")
+        out.flush()
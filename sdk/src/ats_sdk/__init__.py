@@ -5,14 +5,14 @@ via Serial, WebSocket, or BLE using CBOR-RPC protocol.
 """
 
 from .base import AsyncRpcTransport
-from .transports import AsyncSerialRpc, AsyncWebSocketRpc, AsyncBleRpc
 from .framing import decode_frame, encode_frame
-from .radio import Radio, RpcError
+from .radio import STEP_CONTROLS, Radio, RpcError
 
 __all__ = [
     # High-level
     "Radio",
     "RpcError",
+    "STEP_CONTROLS",
     # Async transports
     "AsyncRpcTransport",
     "AsyncSerialRpc",
@@ -24,3 +24,19 @@ __all__ = [
 ]
 
 __version__ = "0.2.0"
+
+
+def __getattr__(name):
+    # Transports are resolved lazily so `from ats_sdk import Radio` doesn't
+    # import bleak and websockets
+    if name in ("AsyncSerialRpc", "AsyncWebSocketRpc", "AsyncBleRpc"):
+        from . import transports
+
+        value = getattr(transports, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
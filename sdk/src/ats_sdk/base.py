@@ -1,25 +1,47 @@
 """Abstract base class for async RPC transports."""
 
 import asyncio
+import itertools
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple
 
 import cbor2
 
+from .cache import TtlCache
 from .framing import decode_frame, encode_frame
 
+# Messages nobody was waiting for (events, early replies) kept for read_message
+INBOX_SIZE = 256
+
 
 class AsyncRpcTransport(ABC):
     """Abstract base class for async RPC transports (Serial, WebSocket, BLE).
 
     This class provides common RPC protocol logic (request/response handling,
-    event skipping, timeouts) while delegating transport-specific I/O to
+    reply/event demultiplexing, timeouts) while delegating transport-specific I/O to
     subclasses.
     """
 
     def __init__(self):
-        self._next_id = 1
+        self._ids = itertools.count(1)
+        # A single reader task runs while anyone is waiting and routes each
+        # frame: replies resolve the future registered for their id, anything
+        # else goes to a read_message() waiter or, failing that, the inbox
+        self._reader: Optional[asyncio.Task] = None
+        self._read_deadline = 0.0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._requesters: Dict[int, Optional[asyncio.Task]] = {}
+        self._claimed: Set[int] = set()
+        self._message_waiters: Deque[Tuple[Optional[asyncio.Task], asyncio.Future]] = (
+            deque()
+        )
+        self._inbox: Deque[Tuple[Dict[str, Any], Optional[asyncio.Future]]] = deque(
+            maxlen=INBOX_SIZE
+        )
+        # Replies memoized by cached_call(), keyed by (method, params)
+        self.cache = TtlCache()
         self.logger = logging.getLogger(f"ats_sdk.{self.__class__.__name__}")
 
     @abstractmethod
@@ -73,6 +95,9 @@ class AsyncRpcTransport(ABC):
     ) -> int:
         """Send an RPC request and return the request ID.
 
+        The reply is kept for read_response() until INBOX_SIZE newer
+        unclaimed messages have arrived; after that it is dropped.
+
         Args:
             method: RPC method name (e.g. "volume.set", "status.get")
             params: Optional method parameters
@@ -84,9 +109,23 @@ class AsyncRpcTransport(ABC):
         Raises:
             ConnectionError: If not connected or write fails
         """
+        request_id, frame = self._prepare_request(method, params, request_id)
+        try:
+            await self.write_frame(frame)
+        except BaseException:
+            self._forget(request_id)
+            raise
+        return request_id
+
+    def _prepare_request(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]],
+        request_id: Optional[int] = None,
+    ) -> Tuple[int, bytes]:
+        """Encode a request frame and register the future for its reply."""
         if request_id is None:
-            request_id = self._next_id
-            self._next_id += 1
+            request_id = next(self._ids)
 
         payload = {
             "id": request_id,
@@ -97,16 +136,38 @@ class AsyncRpcTransport(ABC):
         cbor_data = cbor2.dumps(payload)
         frame = encode_frame(cbor_data)
 
-        self.logger.debug(
-            f"→ REQUEST id={request_id} method={method} params={params} ({len(frame)} bytes)"
-        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "→ REQUEST id=%s method=%s params=%s (%d bytes)",
+                request_id,
+                method,
+                params,
+                len(frame),
+            )
 
-        await self.write_frame(frame)
-        return request_id
+        self._pending[request_id] = asyncio.get_running_loop().create_future()
+        self._requesters[request_id] = asyncio.current_task()
+        return request_id, frame
+
+    def _forget(self, request_id: int) -> None:
+        self._pending.pop(request_id, None)
+        self._requesters.pop(request_id, None)
+
+    async def write_frames(self, frames: Sequence[bytes]) -> None:
+        """Write several complete frames in order.
+
+        Stream transports (serial, BLE) override this to coalesce the frames
+        into a single write; the default writes them one at a time.
+        """
+        for frame in frames:
+            await self.write_frame(frame)
 
     async def read_message(self, timeout: float = 3.0) -> Dict[str, Any]:
         """Read and decode the next message (response or event).
 
+        Responses already claimed by a read_response() call are not returned
+        here; each reply is delivered exactly once.
+
         Args:
             timeout: Read timeout in seconds
 
@@ -117,35 +178,76 @@ class AsyncRpcTransport(ABC):
             TimeoutError: If timeout expires
             ConnectionError: If connection lost
         """
+        task = asyncio.current_task()
+        for entry in list(self._inbox):
+            message, fut = entry
+            if fut is not None:
+                msg_id = message.get("id")
+                if self._pending.get(msg_id) is not fut or msg_id in self._claimed:
+                    # read_response() already took this reply
+                    self._inbox.remove(entry)
+                    continue
+                if self._requesters.get(msg_id) is not task:
+                    # Left for the task that sent the request
+                    continue
+                self._forget(msg_id)
+            self._inbox.remove(entry)
+            return message
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (asyncio.current_task(), waiter)
+        self._message_waiters.append(entry)
+        self._start_reader(timeout)
+        try:
+            async with asyncio.timeout(timeout):
+                return await waiter
+        except TimeoutError:
+            raise TimeoutError(f"No message received within {timeout}s") from None
+        finally:
+            try:
+                self._message_waiters.remove(entry)
+            except ValueError:
+                pass
+
+    async def _read_message(self, timeout: float) -> Dict[str, Any]:
+        """Read and decode the next message; only the reader task calls this."""
         frame = await self.read_frame(timeout)
         payload = decode_frame(frame)
 
         try:
             message = cbor2.loads(payload)
-        except Exception as e:
+        except cbor2.CBORDecodeError as e:
             self.logger.error(f"CBOR decode failed: {e}")
             self.logger.error(
                 f"Payload ({len(payload)} bytes): {payload[:64].hex()}..."
             )
             raise ValueError(f"Failed to decode CBOR message: {e}") from e
 
-        msg_type = message.get("type", "response")
-        if msg_type == "event":
-            self.logger.debug(
-                f"← EVENT {message.get('event')} params={message.get('params')}"
-            )
-        else:
-            self.logger.debug(
-                f"← RESPONSE id={message.get('id')} "
-                f"result={message.get('result')} error={message.get('error')}"
-            )
+        if not isinstance(message, dict):
+            raise ValueError(f"Expected CBOR map, got {type(message).__name__}")
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            if message.get("type", "response") == "event":
+                self.logger.debug(
+                    "← EVENT %s params=%s", message.get("event"), message.get("params")
+                )
+            else:
+                self.logger.debug(
+                    "← RESPONSE id=%s result=%s error=%s",
+                    message.get("id"),
+                    message.get("result"),
+                    message.get("error"),
+                )
 
         return message
 
     async def read_response(
         self, request_id: int, timeout: float = 5.0
     ) -> Dict[str, Any]:
-        """Read response for a specific request ID, skipping any events.
+        """Read response for a specific request ID.
+
+        Events that arrive meanwhile are handed to read_message() instead of
+        being dropped.
 
         Args:
             request_id: Request ID to wait for
@@ -158,34 +260,234 @@ class AsyncRpcTransport(ABC):
             TimeoutError: If timeout expires before response received
             ConnectionError: If connection lost
         """
-        deadline = asyncio.get_event_loop().time() + timeout
         self.logger.debug(
-            f"Waiting for response to request id={request_id} (timeout={timeout}s)"
+            "Waiting for response to request id=%s (timeout=%ss)", request_id, timeout
         )
 
-        skipped_events = 0
+        fut = self._pending.get(request_id)
+        if fut is None:
+            fut = self._pending[request_id] = asyncio.get_running_loop().create_future()
+        self._claimed.add(request_id)
+        self._start_reader(timeout)
+        try:
+            async with asyncio.timeout(timeout):
+                return await fut
+        except TimeoutError:
+            raise TimeoutError(
+                f"Timed out waiting for response to request id={request_id}"
+            ) from None
+        finally:
+            # Also on timeout or cancellation, so a reply that never comes
+            # (or comes late) leaves nothing registered behind
+            self._claimed.discard(request_id)
+            self._forget(request_id)
+
+    def _start_reader(self, timeout: float) -> None:
+        """Make sure the reader task runs for at least ``timeout`` seconds."""
+        loop = asyncio.get_running_loop()
+        self._read_deadline = max(self._read_deadline, loop.time() + timeout)
+        if self._reader is None or self._reader.done():
+            self._reader = loop.create_task(self._reader_loop())
+
+    def _has_waiters(self) -> bool:
+        if any(not waiter.done() for _, waiter in self._message_waiters):
+            return True
+        return any(
+            rid in self._pending and not self._pending[rid].done()
+            for rid in self._claimed
+        )
 
-        while asyncio.get_event_loop().time() < deadline:
-            remaining = deadline - asyncio.get_event_loop().time()
+    async def _reader_loop(self) -> None:
+        """Read and dispatch frames for as long as anyone is waiting."""
+        loop = asyncio.get_running_loop()
+        while self._has_waiters():
+            remaining = self._read_deadline - loop.time()
             if remaining <= 0:
-                break
+                return
+            try:
+                message = await self._read_message(remaining)
+            except TimeoutError:
+                continue
+            except Exception as e:
+                self._fail_waiters(e)
+                return
+            self._dispatch(message)
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        """Route one decoded message to whoever should receive it."""
+        if message.get("type") != "event":
+            msg_id = message.get("id")
+            fut = self._pending.get(msg_id)
+            if fut is not None:
+                if msg_id in self._claimed:
+                    if not fut.done():
+                        fut.set_result(message)
+                    return
+                # Not claimed yet. If the task that sent the request is
+                # already in read_message(), it gets the reply there;
+                # otherwise whichever of read_response() and read_message()
+                # asks first does. Other read_message() callers (an events
+                # stream, say) must not take it from a read_response() that
+                # just hasn't started waiting yet.
+                requester = self._requesters.get(msg_id)
+                if requester is not None and self._deliver(message, requester):
+                    self._forget(msg_id)
+                    return
+                if not fut.done():
+                    fut.set_result(message)
+                self._to_inbox(message, fut)
+                return
+
+        if not self._deliver(message):
+            self._to_inbox(message, None)
+
+    def _to_inbox(self, message: Dict[str, Any], fut: Optional[asyncio.Future]) -> None:
+        """Park a message for read_message(), evicting the oldest when full."""
+        if len(self._inbox) == self._inbox.maxlen:
+            oldest, oldest_fut = self._inbox[0]
+            self.logger.debug(
+                "Inbox full (%d messages), dropping the oldest: %s", INBOX_SIZE, oldest
+            )
+            # An unread reply goes with its request's registration, so
+            # requests nobody reads (fire-and-forget) don't pile up
+            oldest_id = oldest.get("id")
+            if (
+                oldest_fut is not None
+                and self._pending.get(oldest_id) is oldest_fut
+                and oldest_id not in self._claimed
+            ):
+                self._forget(oldest_id)
+        self._inbox.append((message, fut))
+
+    def _deliver(
+        self, message: Dict[str, Any], task: Optional[asyncio.Task] = None
+    ) -> bool:
+        """Hand a message to the oldest live read_message() waiter.
+
+        With ``task``, only a waiter in that task qualifies.
+        """
+        for entry in list(self._message_waiters):
+            waiter_task, waiter = entry
+            if waiter.done():
+                self._message_waiters.remove(entry)
+            elif task is None or waiter_task is task:
+                self._message_waiters.remove(entry)
+                waiter.set_result(message)
+                return True
+        return False
 
-            msg = await self.read_message(timeout=remaining)
+    def _fail_waiters(self, exc: BaseException) -> None:
+        for _, waiter in self._message_waiters:
+            if not waiter.done():
+                waiter.set_exception(exc)
+        for rid in self._claimed:
+            fut = self._pending.get(rid)
+            if fut is not None and not fut.done():
+                fut.set_exception(exc)
 
-            # Skip events - we're looking for a response
-            if msg.get("type") == "event":
-                skipped_events += 1
-                continue
+    def _stop_reader(self) -> None:
+        """Cancel the reader task and fail everyone still waiting.
 
-            # Check if this is the response we're waiting for
-            if msg.get("id") == request_id:
-                if skipped_events > 0:
-                    self.logger.debug(
-                        f"Skipped {skipped_events} event(s) while waiting for response"
-                    )
-                return msg
+        Transports call this from close().
+        """
+        if self._reader is not None and not self._reader.done():
+            self._reader.cancel()
+        self._reader = None
+        self._fail_waiters(ConnectionError("Connection closed"))
+        self._pending.clear()
+        self._requesters.clear()
+        self._inbox.clear()
+
+    async def call(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: float = 5.0,
+    ) -> Dict[str, Any]:
+        """Send a request and wait for its response.
 
-        raise TimeoutError(f"Timed out waiting for response to request id={request_id}")
+        Safe to await concurrently: with ``asyncio.gather`` every request
+        frame goes out before the first reply comes back.
+
+        Args:
+            method: RPC method name (e.g. "volume.set", "status.get")
+            params: Optional method parameters
+            timeout: Timeout in seconds for the response
+
+        Returns:
+            Response message dictionary
+
+        Raises:
+            TimeoutError: If timeout expires before response received
+            ConnectionError: If not connected or connection lost
+        """
+        request_id = await self.request(method, params)
+        return await self.read_response(request_id, timeout)
+
+    async def cached_call(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        ttl: float = 1.0,
+        timeout: float = 5.0,
+    ) -> Dict[str, Any]:
+        """Like call(), but reuse a successful reply for ``ttl`` seconds.
+
+        Only use this for reads; callers are responsible for invalidating
+        ``self.cache`` after writes that affect the cached value.
+
+        Args:
+            method: RPC method name (e.g. "ble.get")
+            params: Optional method parameters
+            ttl: How long the reply stays valid, in seconds
+            timeout: Timeout in seconds for the response
+
+        Returns:
+            Response message dictionary
+        """
+        key = (method, tuple(sorted((params or {}).items())))
+        reply = self.cache.get(key)
+        if reply is None:
+            reply = await self.call(method, params, timeout)
+            if reply.get("error") is None:
+                self.cache.set(key, reply, ttl)
+        return reply
+
+    async def call_batch(
+        self,
+        calls: Sequence[Tuple[str, Optional[Dict[str, Any]]]],
+        timeout: float = 5.0,
+    ) -> List[Dict[str, Any]]:
+        """Send several requests back-to-back and collect their responses.
+
+        All request frames are written before any response is read, so the
+        link round-trip is paid once for the whole batch instead of per call.
+        On stream transports the frames also go out in a single write.
+
+        Args:
+            calls: Sequence of (method, params) tuples
+            timeout: Timeout in seconds for each response
+
+        Returns:
+            Response message dictionaries, in the same order as ``calls``
+
+        Raises:
+            TimeoutError: If timeout expires before all responses are received
+            ConnectionError: If connection lost
+        """
+        prepared = [self._prepare_request(method, params) for method, params in calls]
+        request_ids = [request_id for request_id, _ in prepared]
+        try:
+            await self.write_frames([frame for _, frame in prepared])
+        except BaseException:
+            for request_id in request_ids:
+                self._forget(request_id)
+            raise
+        return list(
+            await asyncio.gather(
+                *(self.read_response(request_id, timeout) for request_id in request_ids)
+            )
+        )
 
     async def __aenter__(self):
         """Async context manager entry - connects to device."""
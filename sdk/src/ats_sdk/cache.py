@@ -0,0 +1,28 @@
+"""Small TTL cache for memoizing idempotent RPC reads."""
+
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TtlCache:
+    """Dictionary whose entries expire ``ttl`` seconds after being set."""
+
+    def __init__(self):
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expiry, value = entry
+        if time.monotonic() >= expiry:
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
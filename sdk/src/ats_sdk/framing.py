@@ -1,12 +1,27 @@
+import struct
+
+# Largest payload accepted from the wire (screen captures are the big ones)
+MAX_FRAME_SIZE = 1_000_000
+
+# 4-byte big-endian payload length in front of every frame
+FRAME_HEADER = struct.Struct(">I")
+
+
 def encode_frame(payload: bytes) -> bytes:
-    length = len(payload)
-    return length.to_bytes(4, "big") + payload
+    return FRAME_HEADER.pack(len(payload)) + payload
 
 
 def decode_frame(message: bytes) -> bytes:
+    """Return the payload of a framed message.
+
+    The payload is sliced out as bytes rather than viewed: cbor2 copies any
+    other buffer type internally, which measured slower than the slice.
+    """
     if len(message) < 4:
         raise ValueError("Frame too short")
-    length = int.from_bytes(message[:4], "big")
+    (length,) = FRAME_HEADER.unpack_from(message)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame too large: {length} bytes")
     payload = message[4:]
     if length != len(payload):
         raise ValueError("Length mismatch")
@@ -1,6 +1,6 @@
 """High-level typed wrapper around ATS-Mini CBOR-RPC transport."""
 
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
 from .base import AsyncRpcTransport
 
@@ -14,6 +14,19 @@ class RpcError(Exception):
         super().__init__(f"RPC error {code}: {message}")
 
 
+# Controls the firmware can step with <control>.up / <control>.down
+STEP_CONTROLS = (
+    "volume",
+    "band",
+    "mode",
+    "step",
+    "bandwidth",
+    "agc",
+    "backlight",
+    "cal",
+)
+
+
 class Radio:
     """Typed convenience wrapper around a raw RPC transport.
 
@@ -24,10 +37,18 @@ class Radio:
             vol = await radio.get_volume()
             await radio.set_volume(10)
             settings = await radio.get_all_settings()
+
+    Pass ``cache_ttl`` to memoize ``*.get`` replies for that many seconds;
+    any other call clears the cache, since one write can change several
+    reads (``band.set`` also moves mode, step and frequency).
     """
 
-    def __init__(self, transport: AsyncRpcTransport):
+    _UP_METHODS = {control: f"{control}.up" for control in STEP_CONTROLS}
+    _DOWN_METHODS = {control: f"{control}.down" for control in STEP_CONTROLS}
+
+    def __init__(self, transport: AsyncRpcTransport, cache_ttl: Optional[float] = None):
         self._t = transport
+        self._cache_ttl = cache_ttl
 
     async def _call(
         self,
@@ -35,8 +56,20 @@ class Radio:
         params: Optional[Dict[str, Any]] = None,
         timeout: float = 5.0,
     ) -> Dict[str, Any]:
-        req_id = await self._t.request(method, params)
-        reply = await self._t.read_response(req_id, timeout=timeout)
+        if self._cache_ttl is None:
+            return self._unwrap(await self._t.call(method, params, timeout))
+        if method.endswith(".get"):
+            reply = await self._t.cached_call(method, params, self._cache_ttl, timeout)
+        else:
+            try:
+                reply = await self._t.call(method, params, timeout)
+            finally:
+                # Even a timed-out write may have reached the radio
+                self._t.cache.clear()
+        return self._unwrap(reply)
+
+    @staticmethod
+    def _unwrap(reply: Dict[str, Any]) -> Dict[str, Any]:
         err = reply.get("error")
         if err is not None:
             if isinstance(err, dict):
@@ -48,6 +81,37 @@ class Radio:
             raise RpcError(code, message)
         return reply.get("result", {})
 
+    async def batch(
+        self,
+        calls: Sequence[Tuple[str, Optional[Dict[str, Any]]]],
+        timeout: float = 5.0,
+    ) -> List[Dict[str, Any]]:
+        """Issue several raw RPC calls in one round-trip.
+
+        Setters are sent back to back too, so a scripted sweep such as
+        ``[("volume.set", {"value": v}) for v in range(20)]`` costs one
+        round-trip instead of one per step.
+
+        Args:
+            calls: Sequence of (method, params) tuples, e.g.
+                ``[("volume.get", None), ("band.get", None)]``
+            timeout: Total timeout in seconds for all responses
+
+        Returns:
+            Result dictionaries, in the same order as ``calls``.
+
+        Raises:
+            RpcError: If any call returned an error
+        """
+        try:
+            replies = await self._t.call_batch(calls, timeout=timeout)
+        finally:
+            if self._cache_ttl is not None and any(
+                not method.endswith(".get") for method, _ in calls
+            ):
+                self._t.cache.clear()
+        return [self._unwrap(reply) for reply in replies]
+
     # -- bulk --
 
     async def get_all_settings(self) -> Dict[str, Any]:
@@ -281,6 +345,24 @@ class Radio:
     async def set_cal(self, value: int) -> Dict[str, Any]:
         return await self._call("cal.set", {"value": value})
 
+    # -- up/down stepping --
+
+    async def up(self, control: str) -> Dict[str, Any]:
+        """Step ``control`` (one of STEP_CONTROLS) up; returns the new status."""
+        try:
+            method = self._UP_METHODS[control]
+        except KeyError:
+            raise ValueError(f"Unknown control: {control!r}") from None
+        return await self._call(method)
+
+    async def down(self, control: str) -> Dict[str, Any]:
+        """Step ``control`` (one of STEP_CONTROLS) down; returns the new status."""
+        try:
+            method = self._DOWN_METHODS[control]
+        except KeyError:
+            raise ValueError(f"Unknown control: {control!r}") from None
+        return await self._call(method)
+
     # -- simple controls --
 
     async def sleep_on(self) -> Dict[str, Any]:
@@ -292,3 +374,60 @@ class Radio:
     async def memory_list(self) -> list:
         r = await self._call("memory.list")
         return r.get("memories", [])
+
+    # -- screen --
+
+    async def screen_capture(
+        self, fmt: str = "binary", timeout: float = 5.0
+    ) -> AsyncIterator[bytes]:
+        """Capture the display and yield its data chunks in stream order.
+
+        ``binary`` produces a BMP image, ``rle`` the firmware's delta-RLE
+        encoding. Chunks are yielded as they arrive rather than collected, so
+        callers can write them out without holding the whole image.
+
+        Args:
+            fmt: Capture format, ``"binary"`` or ``"rle"``
+            timeout: Timeout in seconds for each chunk
+
+        Raises:
+            TimeoutError: If a chunk does not arrive within ``timeout``
+        """
+        info = await self._call("screen.capture", {"format": fmt})
+        stream_id = info["stream_id"]
+        while True:
+            msg = await self._t.read_message(timeout=timeout)
+            if msg.get("type") != "event":
+                continue
+            params = msg.get("params") or {}
+            if params.get("stream_id") != stream_id:
+                continue
+            if msg.get("event") == "screen.chunk":
+                yield params.get("data", b"")
+            elif msg.get("event") == "screen.done":
+                return
+
+    # -- events --
+
+    async def subscribe_events(self, event: str = "stats") -> bool:
+        r = await self._call("events.subscribe", {"event": event})
+        return r["enabled"]
+
+    async def unsubscribe_events(self, event: str = "stats") -> bool:
+        r = await self._call("events.unsubscribe", {"event": event})
+        return r["enabled"]
+
+    async def events(self, idle_timeout: float = 30.0) -> AsyncIterator[Dict[str, Any]]:
+        """Yield event messages as they arrive.
+
+        Each read awaits the transport directly, so events are delivered as
+        soon as their frame is complete. Quiet periods longer than
+        ``idle_timeout`` just restart the read; stray responses are skipped.
+        """
+        while True:
+            try:
+                msg = await self._t.read_message(timeout=idle_timeout)
+            except TimeoutError:
+                continue
+            if msg.get("type") == "event":
+                yield msg
@@ -1,11 +1,32 @@
-"""Transport modules for ATS-Mini SDK."""
+"""Transport modules for ATS-Mini SDK.
 
-from .serial import AsyncSerialRpc
-from .websocket import AsyncWebSocketRpc
-from .ble import AsyncBleRpc
+Transports are loaded on first access so importing one doesn't pull in the
+dependencies of the others (bleak, websockets, pyserial).
+"""
+
+import importlib
+
+_TRANSPORTS = {
+    "AsyncSerialRpc": ".serial",
+    "AsyncWebSocketRpc": ".websocket",
+    "AsyncBleRpc": ".ble",
+}
 
 __all__ = [
     "AsyncSerialRpc",
     "AsyncWebSocketRpc",
     "AsyncBleRpc",
 ]
+
+
+def __getattr__(name):
+    module = _TRANSPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,19 +1,31 @@
 """BLE transport for ATS-Mini using Nordic UART Service."""
 
 import asyncio
+import json
 import logging
-from typing import Optional
+import os
+from pathlib import Path
+from typing import Dict, Optional, Sequence
 
 from bleak import BleakClient, BleakScanner
+from bleak.exc import BleakError
 from bleak.backends.characteristic import BleakGATTCharacteristic
 
 from ..base import AsyncRpcTransport
+from ..framing import FRAME_HEADER, MAX_FRAME_SIZE
 
 # Nordic UART Service UUIDs
 NUS_SERVICE_UUID = "6E400001-B5A3-F393-E0A9-E50E24DCCA9E"
 NUS_RX_CHAR_UUID = "6E400002-B5A3-F393-E0A9-E50E24DCCA9E"  # Write to device
 NUS_TX_CHAR_UUID = "6E400003-B5A3-F393-E0A9-E50E24DCCA9E"  # Notify from device
 
+# Last connected address per device name, so reconnects can skip the scan
+ADDRESS_CACHE = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "ats_sdk"
+    / "last_ble.json"
+)
+
 
 class AsyncBleRpc(AsyncRpcTransport):
     """Async BLE RPC client using Nordic UART Service.
@@ -22,48 +34,80 @@ class AsyncBleRpc(AsyncRpcTransport):
     protocol as Serial/WebSocket transports. Requires mode switching (0x1E byte).
     """
 
-    def __init__(self, device_name: str = "ATS-Mini", scan_timeout: float = 10.0):
+    def __init__(
+        self,
+        device_name: str = "ATS-Mini",
+        scan_timeout: float = 10.0,
+        flow_ctrl_every: int = 4,
+        cache_address: bool = True,
+    ):
         """Initialize BLE RPC client.
 
         Args:
             device_name: BLE device name to search for (default: "ATS-Mini")
             scan_timeout: Timeout for device discovery scan in seconds
+            flow_ctrl_every: When writing without response, acknowledge every
+                Nth chunk of a multi-chunk frame so the peripheral can pace us
+            cache_address: Remember the device address in ADDRESS_CACHE and
+                try it before scanning on the next connect
         """
         super().__init__()
         self.device_name = device_name
         self.scan_timeout = scan_timeout
+        self.flow_ctrl_every = max(1, flow_ctrl_every)
+        self.cache_address = cache_address
 
         self._client: Optional[BleakClient] = None
         self._rx_char: Optional[BleakGATTCharacteristic] = None
         self._tx_char: Optional[BleakGATTCharacteristic] = None
         self._rx_buffer = bytearray()
+        # Payload length of the frame at the head of _rx_buffer, once known
+        self._expected_len: Optional[int] = None
         self._rx_event = asyncio.Event()
         self._disconnect_event = asyncio.Event()
         self._mtu = 517  # ESP32 default, effective payload is MTU-3
         self._write_with_response = True
+        self._can_ack = True
 
     async def connect(self) -> None:
         """Discover and connect to BLE device."""
-        # Scan for device
-        self.logger.info(f"Scanning for BLE device '{self.device_name}'...")
-
-        device = await BleakScanner.find_device_by_name(
-            self.device_name, timeout=self.scan_timeout
-        )
-
-        if device is None:
-            raise ConnectionError(
-                f"Device '{self.device_name}' not found after {self.scan_timeout}s scan. "
-                f"Ensure device is powered on and BLE is enabled."
+        # Never reuse a client from an earlier connection; it may be dead,
+        # and a live one would otherwise stay connected behind our back
+        await self.close()
+        self._rx_buffer.clear()
+        self._expected_len = None
+        self._rx_event.clear()
+
+        # A previously seen address connects without the scan
+        address = self._load_address() if self.cache_address else None
+        if address is not None:
+            self.logger.info(f"Connecting to cached address {address}...")
+            client = BleakClient(
+                address, disconnected_callback=self._on_disconnect, timeout=3.0
             )
+            try:
+                await client.connect()
+                self._client = client
+            except (BleakError, TimeoutError, OSError) as e:
+                self.logger.info(f"Cached address failed ({e}), scanning instead")
+
+        # The address may now belong to another device (or the radio with
+        # Bluetooth in a different mode): drop it and scan by name instead
+        if self._client is not None and not self._has_nus(self._client):
+            self.logger.info(
+                "Cached device has no Nordic UART Service, scanning instead"
+            )
+            try:
+                await self._client.disconnect()
+            except (BleakError, TimeoutError, OSError) as e:
+                self.logger.debug(f"Error disconnecting cached device: {e}")
+            self._client = None
+            self._forget_address()
 
-        self.logger.info(f"Found device: {device.name} ({device.address})")
-
-        # Connect
-        self._client = BleakClient(device, disconnected_callback=self._on_disconnect)
-
-        await self._client.connect()
-        self.logger.info(f"Connected to {device.name}")
+        if self._client is None:
+            await self._scan_and_connect()
+        assert self._client is not None
+        self.logger.info(f"Connected to {self.device_name}")
 
         # Trigger MTU negotiation (best-effort, uses Bleak internal API)
         try:
@@ -75,7 +119,7 @@ class AsyncBleRpc(AsyncRpcTransport):
         services = self._client.services
 
         # Log all available services and characteristics for debugging
-        self.logger.debug(f"=== BLE Services on '{device.name}' ===")
+        self.logger.debug(f"=== BLE Services on '{self.device_name}' ===")
         for service in services:
             self.logger.debug(f"  Service: {service.uuid}")
             for char in service.characteristics:
@@ -109,6 +153,7 @@ class AsyncBleRpc(AsyncRpcTransport):
         # Determine if the RX characteristic supports write-without-response
         rx_props = set(self._rx_char.properties or [])
         self._write_with_response = "write-without-response" not in rx_props
+        self._can_ack = "write" in rx_props
 
         # Subscribe to TX characteristic (notifications from device)
         await self._client.start_notify(self._tx_char, self._on_notification)
@@ -120,23 +165,90 @@ class AsyncBleRpc(AsyncRpcTransport):
             self._mtu = self._client.mtu_size
             self.logger.debug(f"MTU: {self._mtu} bytes")
 
+        if self.cache_address:
+            self._save_address(self._client.address)
+
+    async def _scan_and_connect(self) -> None:
+        self.logger.info(f"Scanning for BLE device '{self.device_name}'...")
+
+        device = await BleakScanner.find_device_by_name(
+            self.device_name, timeout=self.scan_timeout
+        )
+
+        if device is None:
+            raise ConnectionError(
+                f"Device '{self.device_name}' not found after {self.scan_timeout}s scan. "
+                f"Ensure device is powered on and BLE is enabled."
+            )
+
+        self.logger.info(f"Found device: {device.name} ({device.address})")
+
+        self._client = BleakClient(device, disconnected_callback=self._on_disconnect)
+        await self._client.connect()
+
+    @staticmethod
+    def _has_nus(client: BleakClient) -> bool:
+        services = client.services
+        return (
+            services.get_characteristic(NUS_TX_CHAR_UUID) is not None
+            and services.get_characteristic(NUS_RX_CHAR_UUID) is not None
+        )
+
+    def _load_address(self) -> Optional[str]:
+        return self._read_address_cache().get(self.device_name)
+
+    def _save_address(self, address: str) -> None:
+        cache = self._read_address_cache()
+        if cache.get(self.device_name) == address:
+            return
+        cache[self.device_name] = address
+        self._write_address_cache(cache)
+
+    def _forget_address(self) -> None:
+        cache = self._read_address_cache()
+        if cache.pop(self.device_name, None) is not None:
+            self._write_address_cache(cache)
+
+    @staticmethod
+    def _read_address_cache() -> Dict[str, str]:
+        try:
+            cache = json.loads(ADDRESS_CACHE.read_text())
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def _write_address_cache(self, cache: Dict[str, str]) -> None:
+        try:
+            ADDRESS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            ADDRESS_CACHE.write_text(json.dumps(cache))
+        except OSError as e:
+            self.logger.debug(f"Could not save BLE address cache: {e}")
+
     async def close(self) -> None:
         """Disconnect from BLE device."""
-        if self._client and self._client.is_connected:
+        self._stop_reader()
+        client, tx_char = self._client, self._tx_char
+        # Drop the client even if the link is already gone, so the next
+        # connect() starts from a fresh one
+        self._client = None
+        self._tx_char = None
+        self._rx_char = None
+        if client and client.is_connected:
             try:
-                if self._tx_char is not None:
-                    await self._client.stop_notify(self._tx_char)
+                if tx_char is not None:
+                    await client.stop_notify(tx_char)
             except Exception as e:
                 self.logger.warning(f"Error stopping notifications: {e}")
 
-            await self._client.disconnect()
-            self._client = None
-            self._tx_char = None
-            self._rx_char = None
+            await client.disconnect()
             self.logger.info("AsyncBleRpc disconnected")
 
-    async def write_raw(self, data: bytes) -> None:
-        """Write raw bytes to RX characteristic (write to device)."""
+    async def write_raw(self, data: bytes, response: Optional[bool] = None) -> None:
+        """Write raw bytes to RX characteristic (write to device).
+
+        ``response`` overrides whether the write waits for the peripheral's
+        acknowledgement; by default it follows the characteristic's properties.
+        """
         if not self._client or not self._client.is_connected:
             raise ConnectionError("Not connected to BLE device")
         if self._rx_char is None:
@@ -145,9 +257,9 @@ class AsyncBleRpc(AsyncRpcTransport):
             )
 
         # Write to RX characteristic (write to device)
-        await self._client.write_gatt_char(
-            self._rx_char, data, response=self._write_with_response
-        )
+        if response is None:
+            response = self._write_with_response
+        await self._client.write_gatt_char(self._rx_char, data, response=response)
 
     async def write_frame(self, frame: bytes) -> None:
         """Write frame to BLE device, chunking if necessary.
@@ -158,41 +270,49 @@ class AsyncBleRpc(AsyncRpcTransport):
         # BLE has lower MTU than serial/WS, need to chunk
         chunk_size = self._mtu - 3  # Account for ATT header
 
-        offset = 0
-        while offset < len(frame):
+        # Writes without response can outrun the peripheral's buffers. Let
+        # the BLE stack pace us by waiting for an ACK every few chunks instead
+        # of sleeping; only fall back to a fixed delay if ACKs aren't possible
+        offsets = range(0, len(frame), chunk_size)
+        for index, offset in enumerate(offsets, 1):
             chunk = frame[offset : offset + chunk_size]
-            await self.write_raw(chunk)
-            offset += chunk_size
-
-            # Small delay between chunks to avoid overwhelming device
-            if offset < len(frame):
-                await asyncio.sleep(0.005)  # 5ms, matches firmware delay
+            if self._write_with_response:
+                await self.write_raw(chunk)
+            elif self._can_ack:
+                ack = index % self.flow_ctrl_every == 0
+                await self.write_raw(chunk, response=ack)
+            else:
+                await self.write_raw(chunk)
+                if index < len(offsets):
+                    await asyncio.sleep(0.005)  # 5ms, matches firmware delay
+
+    async def write_frames(self, frames: Sequence[bytes]) -> None:
+        """Write several frames at once; the firmware parses the byte stream."""
+        await self.write_frame(b"".join(frames))
 
     async def read_frame(self, timeout: float) -> bytes:
         """Read frame from BLE device.
 
-        Waits for notifications to accumulate a complete frame in the buffer.
+        Waits until notifications have accumulated a complete frame in the
+        buffer; the header is parsed once, as soon as it arrives.
         """
-        deadline = asyncio.get_event_loop().time() + timeout
-
-        # Wait for at least 4 bytes (header)
-        while len(self._rx_buffer) < 4:
-            remaining = deadline - asyncio.get_event_loop().time()
-            if remaining <= 0:
-                raise TimeoutError("Timeout waiting for frame header")
-
+        if not self._rx_event.is_set():
             try:
-                await asyncio.wait_for(self._rx_event.wait(), timeout=remaining)
-                self._rx_event.clear()
-            except asyncio.TimeoutError:
-                raise TimeoutError("Timeout waiting for frame header")
+                async with asyncio.timeout(timeout):
+                    await self._rx_event.wait()
+            except TimeoutError:
+                if self._expected_len is None:
+                    raise TimeoutError("Timeout waiting for frame header") from None
+                raise TimeoutError(
+                    f"Timeout waiting for frame payload "
+                    f"(got {len(self._rx_buffer)}/{4 + self._expected_len} bytes)"
+                ) from None
 
-        # Parse length
-        length = int.from_bytes(self._rx_buffer[:4], "big")
-        total_size = 4 + length
+        length = self._expected_len
+        assert length is not None
 
-        # Validate frame length (max 1MB for screen captures)
-        if length > 1_000_000 or length == 0:
+        # Validate frame length (screen captures are the largest frames)
+        if length > MAX_FRAME_SIZE or length == 0:
             # Corrupted frame - clear buffer and resync
             header_hex = self._rx_buffer[:4].hex()
             self.logger.error(
@@ -200,53 +320,58 @@ class AsyncBleRpc(AsyncRpcTransport):
             )
             self.logger.error(f"Clearing {len(self._rx_buffer)} bytes from RX buffer")
             self._rx_buffer.clear()
+            self._expected_len = None
             self._rx_event.clear()
             raise ValueError(
                 f"Invalid frame length: {length} bytes - stream may be out of sync"
             )
 
-        self.logger.debug(f"Message length: {length} bytes (total: {total_size})")
-
-        # Wait for complete frame
-        while len(self._rx_buffer) < total_size:
-            remaining = deadline - asyncio.get_event_loop().time()
-            if remaining <= 0:
-                raise TimeoutError(
-                    f"Timeout waiting for frame payload "
-                    f"(got {len(self._rx_buffer)}/{total_size} bytes)"
-                )
-
-            try:
-                await asyncio.wait_for(self._rx_event.wait(), timeout=remaining)
-                self._rx_event.clear()
-            except asyncio.TimeoutError:
-                raise TimeoutError(
-                    f"Timeout waiting for frame payload "
-                    f"(got {len(self._rx_buffer)}/{total_size} bytes)"
-                )
+        total_size = 4 + length
+        self.logger.debug("Message length: %d bytes (total: %d)", length, total_size)
 
         # Extract complete frame
         frame = bytes(self._rx_buffer[:total_size])
         del self._rx_buffer[:total_size]
 
+        # The next frame may already be (partly) buffered
+        self._expected_len = None
+        self._rx_event.clear()
+        self._check_frame()
+
         return frame
 
+    def _check_frame(self) -> None:
+        """Parse the pending header and signal once its frame is complete."""
+        if self._expected_len is None:
+            if len(self._rx_buffer) < 4:
+                return
+            (self._expected_len,) = FRAME_HEADER.unpack_from(self._rx_buffer)
+
+        length = self._expected_len
+        # Bad headers are signalled right away so read_frame can resync
+        if len(self._rx_buffer) >= 4 + length or length > MAX_FRAME_SIZE or length == 0:
+            self._rx_event.set()
+
     def _on_notification(
         self, characteristic: BleakGATTCharacteristic, data: bytearray
     ):
         """Handle incoming notification from TX characteristic.
 
         Called by Bleak when data is received from the device.
-        Accumulates data in buffer and signals the event.
+        Accumulates data in buffer and signals the event once a whole frame
+        is available.
         """
         self._rx_buffer.extend(data)
-        self._rx_event.set()
+        self._check_frame()
 
     def _on_disconnect(self, client: BleakClient):
         """Handle disconnection event.
 
         Called by Bleak when connection is lost.
         """
+        # A client dropped by close() or connect() may report late
+        if client is not self._client:
+            return
         self.logger.warning("BLE device disconnected")
         self._tx_char = None
         self._rx_char = None
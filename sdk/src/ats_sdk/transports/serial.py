@@ -1,27 +1,65 @@
-"""Async Serial RPC transport using asyncio.to_thread()."""
+"""Async Serial RPC transport driven by the event loop, with thread fallbacks."""
 
 import asyncio
-from typing import Optional
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Sequence, Union
 
 import serial
 
 from ..base import AsyncRpcTransport
+from ..framing import FRAME_HEADER, MAX_FRAME_SIZE
+
+# Frames (or read errors) kept for read_frame(); past this the oldest are dropped
+RX_QUEUE_SIZE = 1024
+# Most a single os.read() takes from the port (the kernel's tty buffer size)
+RX_CHUNK_SIZE = 4096
+# connect() stops discarding stale input once it has gone quiet for this long
+SETTLE_QUIET_TIME = 0.01
 
 
 class AsyncSerialRpc(AsyncRpcTransport):
-    """Async Serial RPC client using asyncio.to_thread() for blocking I/O.
+    """Async Serial RPC client on top of pyserial.
+
+    On POSIX the event loop watches the port's descriptor and splits the
+    incoming stream into frames, which read_frame() takes from a queue;
+    where the port has no descriptor (Windows) a reader thread does the
+    same with blocking reads. A frame that fits the kernel's transmit
+    buffer is written straight from the event loop; anything else goes to
+    a single-worker executor, so frames go out whole and in order without
+    a lock.
 
     Uses DTR control for ESP32-S3 and requires mode switching (0x1E byte)
     to activate CBOR-RPC protocol.
     """
 
-    def __init__(self, port: str, baudrate: int = 115200, timeout: float = 1.0):
+    def __init__(
+        self,
+        port: str,
+        baudrate: int = 115200,
+        timeout: float = 1.0,
+        settle_time: float = 0.1,
+    ):
         super().__init__()
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
+        self.settle_time = settle_time
         self._serial: Optional[serial.Serial] = None
-        self._lock = asyncio.Lock()  # Protect serial port access
+        self._tx_executor: Optional[ThreadPoolExecutor] = None
+        self._tx_fd: Optional[int] = None
+        self._tx_last: Optional[Future] = None
+        self._rx_fd: Optional[int] = None
+        self._rx_buf = bytearray()
+        self._rx_thread: Optional[threading.Thread] = None
+        self._rx_stop = threading.Event()
+        self._frames: "asyncio.Queue[Union[bytes, Exception]]" = asyncio.Queue(
+            RX_QUEUE_SIZE
+        )
+        # Frames dropped since the queue last overflowed and nobody read it
+        self._rx_dropped = 0
 
     async def connect(self) -> None:
         """Establish serial connection and configure port."""
@@ -35,26 +73,82 @@ class AsyncSerialRpc(AsyncRpcTransport):
             ser.dtr = True
             ser.rts = False
             self.logger.debug("Set DTR=True, RTS=False")
+            # USB-serial adapters (FTDI in particular) otherwise hold short
+            # reads back for their latency timer, up to 16 ms per frame.
+            # Only Linux implements it: other POSIX builds of pyserial raise
+            # NotImplementedError, and Linux raises ValueError on ports
+            # without the ioctl (ptys, some CDC drivers)
+            if hasattr(ser, "set_low_latency_mode"):
+                try:
+                    ser.set_low_latency_mode(True)
+                    self.logger.debug("Enabled ASYNC_LOW_LATENCY")
+                except (ValueError, NotImplementedError) as e:
+                    self.logger.debug(f"Low-latency mode not available: {e}")
             return ser
 
         self._serial = await asyncio.to_thread(_open_serial)
 
-        # Brief settle time
-        await asyncio.sleep(0.1)
-
         # Flush any pending data
-        async with self._lock:
-            ser = self._serial
-            assert ser is not None
-            flushed = await asyncio.to_thread(lambda: ser.in_waiting)  # type: ignore[union-attr]
-            await asyncio.to_thread(ser.reset_input_buffer)
-            if flushed > 0:
-                self.logger.debug(f"Flushed {flushed} bytes from input buffer")
+        ser = self._serial
+        flushed = await asyncio.to_thread(self._settle, ser)
+        if flushed > 0:
+            self.logger.debug(f"Flushed {flushed} bytes from input buffer")
+
+        self._tx_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"AsyncSerialRpc-tx-{self.port}"
+        )
+
+        try:
+            fd: Optional[int] = ser.fileno()
+        except OSError:
+            # No pollable descriptor (Windows): fall back to pyserial I/O
+            fd = None
+        # pyserial opens POSIX ports non-blocking, so os.read() and
+        # os.write() from the event loop can't stall it
+        if fd is not None and os.get_blocking(fd):
+            fd = None
+        self._tx_fd = fd
+
+        loop = asyncio.get_running_loop()
+        self._frames = asyncio.Queue(RX_QUEUE_SIZE)
+        self._rx_dropped = 0
+        self._rx_buf = bytearray()
+        if fd is not None:
+            try:
+                loop.add_reader(fd, self._on_readable)
+                self._rx_fd = fd
+            except NotImplementedError:
+                pass  # Loop without add_reader() (Proactor): use the thread
+        if self._rx_fd is None:
+            self._rx_stop.clear()
+            self._rx_thread = threading.Thread(
+                target=self._rx_loop,
+                args=(ser, loop),
+                name=f"AsyncSerialRpc-rx-{self.port}",
+                daemon=True,
+            )
+            self._rx_thread.start()
 
         self.logger.info(f"AsyncSerialRpc connected to {self.port}")
 
     async def close(self) -> None:
         """Close serial connection."""
+        self._stop_reader()
+        if self._rx_fd is not None:
+            asyncio.get_running_loop().remove_reader(self._rx_fd)
+            self._rx_fd = None
+        if self._rx_thread is not None:
+            self._rx_stop.set()
+            if self._serial is not None and hasattr(self._serial, "cancel_read"):
+                self._serial.cancel_read()
+            await asyncio.to_thread(self._rx_thread.join, self.timeout + 1.0)
+            self._rx_thread = None
+        if self._tx_executor is not None:
+            # Lets writes already queued finish before the port closes
+            await asyncio.to_thread(self._tx_executor.shutdown)
+            self._tx_executor = None
+        self._tx_fd = None
+        self._tx_last = None
         if self._serial:
             self.logger.debug(f"Closing serial port {self._serial.port}")
             await asyncio.to_thread(self._serial.close)
@@ -63,90 +157,178 @@ class AsyncSerialRpc(AsyncRpcTransport):
 
     async def write_frame(self, frame: bytes) -> None:
         """Write frame to serial port."""
-        if not self._serial:
+        if not self._serial or not self._tx_executor:
             raise ConnectionError("Not connected")
 
-        async with self._lock:
-            await asyncio.to_thread(self._serial.write, frame)
-            await asyncio.to_thread(self._serial.flush)
+        # Fast path: with no threaded write still queued (which the frame
+        # could overtake), hand the frame to the kernel right here
+        if self._tx_fd is not None and (self._tx_last is None or self._tx_last.done()):
+            try:
+                sent = os.write(self._tx_fd, frame)
+            except BlockingIOError:
+                sent = 0
+            except OSError as e:
+                raise serial.SerialException(f"write failed: {e}") from e
+            if sent == len(frame):
+                return
+            frame = frame[sent:]
+
+        # The single writer thread keeps concurrent frames from interleaving.
+        # write() hands the whole frame to the kernel; flush() would only
+        # block until the UART has drained it, costing an extra thread hop
+        self._tx_last = self._tx_executor.submit(self._serial.write, frame)
+        await asyncio.wrap_future(self._tx_last)
+
+    async def write_frames(self, frames: Sequence[bytes]) -> None:
+        """Write several frames at once; the firmware parses the byte stream."""
+        await self.write_frame(b"".join(frames))
 
     async def read_frame(self, timeout: float) -> bytes:
         """Read frame from serial port."""
         if not self._serial:
             raise ConnectionError("Not connected")
 
-        deadline = asyncio.get_event_loop().time() + timeout
-
-        # Read 4-byte header
-        header = await self._read_exact(4, deadline)
-        length = int.from_bytes(header, "big")
+        try:
+            async with asyncio.timeout(timeout):
+                item = await self._frames.get()
+        except TimeoutError:
+            raise TimeoutError(f"No frame received within {timeout}s") from None
 
-        # Validate frame length (max 1MB for screen captures)
-        if length > 1_000_000 or length == 0:
-            # Corrupted frame - try to flush and resync
-            self.logger.error(
-                f"Invalid frame length: {length} bytes (0x{length:08X}), header={header.hex()}"
-            )
-            # Check if this looks like CBOR data instead of a frame length
-            if header[0] >= 0xA0:  # CBOR map/array markers
-                self.logger.error(
-                    "Header looks like CBOR data - firmware may not be sending frame headers"
-                )
-            async with self._lock:
-                ser = self._serial
-                assert ser is not None
-                pending = await asyncio.to_thread(lambda: ser.in_waiting)  # type: ignore[union-attr]
-                self.logger.error(f"Flushing {pending} bytes from serial buffer")
-                await asyncio.to_thread(ser.reset_input_buffer)
-            raise ValueError(
-                f"Invalid frame length: {length} bytes - stream may be out of sync"
+        if self._rx_dropped:
+            self.logger.debug(
+                "Serial receive queue drained after dropping %d frames",
+                self._rx_dropped,
             )
+            self._rx_dropped = 0
+
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def _settle(self, ser: serial.Serial) -> int:
+        """Discard stale input until it stops arriving or settle_time passes.
 
-        self.logger.debug(f"Message length: {length} bytes")
+        A port that has sent nothing yet is waited on for the full
+        settle_time: boards that reset on DTR print their boot banner
+        some time after the port opens.
+        """
+        flushed = 0
+        start = quiet_since = time.monotonic()
+        while True:
+            waiting = ser.in_waiting
+            now = time.monotonic()
+            if waiting:
+                flushed += waiting
+                ser.reset_input_buffer()
+                quiet_since = now
+            if now - start >= self.settle_time or (
+                flushed and now - quiet_since >= SETTLE_QUIET_TIME
+            ):
+                return flushed
+            time.sleep(0.002)
 
-        # Read payload
+    def _on_readable(self) -> None:
+        """Event loop reader callback: take what has arrived and queue frames."""
+        assert self._rx_fd is not None
         try:
-            payload = await self._read_exact(length, deadline)
-        except TimeoutError as e:
-            self.logger.error(f"Timeout reading payload: expected {length} bytes")
-            async with self._lock:
-                ser = self._serial
-                assert ser is not None
-                pending = await asyncio.to_thread(lambda: ser.in_waiting)  # type: ignore[union-attr]
-                self.logger.error(f"Only {pending} bytes available in buffer")
-            raise
-
-        return header + payload
-
-    async def _read_exact(self, size: int, deadline: float) -> bytes:
-        """Read exact number of bytes with timeout."""
-        data = bytearray()
-
-        while len(data) < size:
-            remaining_time = deadline - asyncio.get_event_loop().time()
-            if remaining_time <= 0:
-                raise TimeoutError(
-                    f"Timeout reading {size} bytes (got {len(data)} bytes)"
+            data = os.read(self._rx_fd, RX_CHUNK_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._rx_lost(ConnectionError(f"Serial read failed: {e}"))
+            return
+        if not data:
+            self._rx_lost(ConnectionError("Serial read failed: device disconnected"))
+            return
+        self._rx_buf += data
+        for item in self._split_frames(self._rx_buf, self._serial):
+            self._enqueue(item)
+
+    def _rx_lost(self, exc: ConnectionError) -> None:
+        """Stop watching a dead descriptor (so the loop doesn't spin) and report it."""
+        asyncio.get_running_loop().remove_reader(self._rx_fd)
+        self._rx_fd = None
+        self._enqueue(exc)
+
+    def _rx_loop(self, ser: serial.Serial, loop: asyncio.AbstractEventLoop) -> None:
+        """Reader thread: split the byte stream into frames for read_frame()."""
+        buf = bytearray()
+        while not self._rx_stop.is_set():
+            try:
+                # Blocks for the first byte (up to the port timeout), then
+                # takes whatever else has already arrived
+                data = ser.read(ser.in_waiting or 1)
+            except (serial.SerialException, OSError, TypeError) as e:
+                if not self._rx_stop.is_set():
+                    self._rx_put(loop, ConnectionError(f"Serial read failed: {e}"))
+                return
+            if not data:
+                continue
+            buf += data
+            for item in self._split_frames(buf, ser):
+                self._rx_put(loop, item)
+
+    def _split_frames(
+        self, buf: bytearray, ser: serial.Serial
+    ) -> List[Union[bytes, Exception]]:
+        """Remove the complete frames at the front of ``buf`` and return them."""
+        items: List[Union[bytes, Exception]] = []
+        while len(buf) >= 4:
+            (length,) = FRAME_HEADER.unpack_from(buf)
+
+            # Validate frame length (screen captures are the largest frames)
+            if length > MAX_FRAME_SIZE or length == 0:
+                # Corrupted frame - flush and resync
+                header = bytes(buf[:4])
+                self.logger.error(
+                    f"Invalid frame length: {length} bytes (0x{length:08X}), header={header.hex()}"
+                )
+                # Check if this looks like CBOR data instead of a frame length
+                if header[0] >= 0xA0:  # CBOR map/array markers
+                    self.logger.error(
+                        "Header looks like CBOR data - firmware may not be sending frame headers"
+                    )
+                self.logger.error(
+                    f"Flushing {len(buf) + ser.in_waiting} bytes from serial buffer"
+                )
+                buf.clear()
+                ser.reset_input_buffer()
+                items.append(
+                    ValueError(
+                        f"Invalid frame length: {length} bytes - stream may be out of sync"
+                    )
                 )
+                break
 
-            # Check if data is available before attempting read
-            async with self._lock:
-                ser = self._serial
-                assert ser is not None
-                available = await asyncio.to_thread(lambda: ser.in_waiting)  # type: ignore[union-attr]
-
-            if available > 0:
-                # Read available data (up to what we need)
-                to_read = min(available, size - len(data))
-                async with self._lock:
-                    ser = self._serial
-                    assert ser is not None
-                    chunk = await asyncio.to_thread(ser.read, to_read)
-
-                if chunk:
-                    data.extend(chunk)
+            if len(buf) < 4 + length:
+                break
+            if len(buf) == 4 + length:
+                # Usual case: the buffer holds just this frame, so copy
+                # it once instead of slicing (a copy) and then bytes()
+                items.append(bytes(buf))
+                buf.clear()
             else:
-                # No data available, small sleep before retry
-                await asyncio.sleep(0.01)
+                items.append(bytes(buf[: 4 + length]))
+                del buf[: 4 + length]
+        return items
 
-        return bytes(data)
+    def _rx_put(
+        self, loop: asyncio.AbstractEventLoop, item: Union[bytes, Exception]
+    ) -> None:
+        try:
+            loop.call_soon_threadsafe(self._enqueue, item)
+        except RuntimeError:
+            # Event loop already closed; nobody is left to read
+            self._rx_stop.set()
+
+    def _enqueue(self, item: Union[bytes, Exception]) -> None:
+        # The port is read even while nobody waits (e.g. subscribed events on
+        # an idle client): keep the newest frames, and warn once per overflow
+        if self._frames.full():
+            self._frames.get_nowait()
+            if not self._rx_dropped:
+                self.logger.warning(
+                    "Serial receive queue full, dropping the oldest frames"
+                )
+            self._rx_dropped += 1
+        self._frames.put_nowait(item)
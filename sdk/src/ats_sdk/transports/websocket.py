@@ -1,6 +1,8 @@
 """Async WebSocket RPC transport."""
 
 import asyncio
+import socket
+from typing import Optional
 
 from ..base import AsyncRpcTransport
 
@@ -11,10 +13,15 @@ class AsyncWebSocketRpc(AsyncRpcTransport):
     No mode switching required - WebSocket is always CBOR-RPC.
     """
 
-    def __init__(self, url: str, timeout: float = 3.0):
+    def __init__(
+        self, url: str, timeout: float = 3.0, compression: Optional[str] = None
+    ):
         super().__init__()
         self.url = url
         self.timeout = timeout
+        # The firmware's WebSocket server never negotiates permessage-deflate
+        # and CBOR frames compress poorly, so don't offer it by default
+        self.compression = compression
         self._ws = None
 
     async def connect(self) -> None:
@@ -25,12 +32,31 @@ class AsyncWebSocketRpc(AsyncRpcTransport):
             f"Connecting to WebSocket {self.url} (timeout={self.timeout}s)"
         )
 
-        self._ws = await websockets.connect(self.url, open_timeout=self.timeout)
+        self._ws = await websockets.connect(
+            self.url, open_timeout=self.timeout, compression=self.compression
+        )
+        self._set_nodelay()
 
         self.logger.info(f"AsyncWebSocketRpc connected to {self.url}")
 
+    def _set_nodelay(self) -> None:
+        """Disable Nagle so small request frames are not delayed by the kernel.
+
+        asyncio's selector loop already does this for TCP transports, but
+        alternative loop implementations may not.
+        """
+        transport = getattr(self._ws, "transport", None)
+        sock = transport.get_extra_info("socket") if transport else None
+        if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+            return
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError as e:
+            self.logger.debug(f"Could not set TCP_NODELAY: {e}")
+
     async def close(self) -> None:
         """Close WebSocket connection."""
+        self._stop_reader()
         if self._ws:
             self.logger.debug("Closing WebSocket connection")
             await self._ws.close()
@@ -50,8 +76,9 @@ class AsyncWebSocketRpc(AsyncRpcTransport):
             raise ConnectionError("Not connected")
 
         try:
-            message = await asyncio.wait_for(self._ws.recv(), timeout=timeout)
-        except asyncio.TimeoutError:
+            async with asyncio.timeout(timeout):
+                message = await self._ws.recv()
+        except TimeoutError:
             raise TimeoutError(f"WebSocket read timeout after {timeout}s")
 
         if isinstance(message, str):
@@ -323,3 +323,71 @@ async def test_invalid_setting_value():
         with pytest.raises((RpcError, ValueError)):  # ValueError if CBOR decode fails
             await radio.set_theme(255)
         log.info("✓ test_invalid_setting_value passed")
+
+
+@pytest.mark.asyncio
+async def test_batch_get():
+    log.info("=== Starting test_batch_get ===")
+    async with AsyncSerialRpc(PORT) as client:
+        radio = Radio(client)
+        volume, band, status = await radio.batch(
+            [("volume.get", None), ("band.get", None), ("status.get", None)]
+        )
+        assert "volume" in volume
+        assert "index" in band
+        assert "frequency" in status
+        log.info(f"✓ test_batch_get passed (volume={volume['volume']})")
+
+
+@pytest.mark.asyncio
+async def test_radio_cached_get():
+    log.info("=== Starting test_radio_cached_get ===")
+    async with AsyncSerialRpc(PORT) as client:
+        radio = Radio(client, cache_ttl=10.0)
+        sent = []
+        write_frame = client.write_frame
+
+        async def counting_write_frame(frame):
+            sent.append(frame)
+            await write_frame(frame)
+
+        client.write_frame = counting_write_frame
+        original = await radio.get_volume()
+        assert len(sent) == 1
+        assert await radio.get_volume() == original
+        assert len(sent) == 1, "Cached get should not send a request"
+        new_volume = 15 if original != 15 else 20
+        try:
+            await radio.set_volume(new_volume)
+            assert await radio.get_volume() == new_volume
+            assert len(sent) == 3, "A setter should invalidate cached gets"
+        finally:
+            await radio.set_volume(original)
+        log.info("✓ test_radio_cached_get passed")
+
+
+@pytest.mark.asyncio
+async def test_radio_events():
+    log.info("=== Starting test_radio_events ===")
+    async with AsyncSerialRpc(PORT) as client:
+        radio = Radio(client)
+        assert await radio.subscribe_events() is True
+        try:
+            event = await asyncio.wait_for(anext(radio.events()), timeout=5.0)
+            assert event.get("event") == "stats"
+            assert "params" in event
+        finally:
+            assert await radio.unsubscribe_events() is False
+        log.info("✓ test_radio_events passed (received stats event)")
+
+
+@pytest.mark.asyncio
+async def test_radio_screen_capture():
+    log.info("=== Starting test_radio_screen_capture ===")
+    async with AsyncSerialRpc(PORT) as client:
+        radio = Radio(client)
+        image = bytearray()
+        async for chunk in radio.screen_capture("binary"):
+            image.extend(chunk)
+        assert image[:2] == b"BM", "Expected a BMP header"
+        log.info(f"✓ test_radio_screen_capture passed ({len(image)} bytes received)")